@@ -2123,8 +2123,9 @@ function runExtractor(
         },
       });
 
-      let stdout = "";
-      let stderr = "";
+      // Collect raw chunks and decode once: a UTF-8 character may be split across chunks.
+      const stdoutChunks = [];
+      const stderrChunks = [];
 
       const disposeCancel =
         token && typeof token.onCancellationRequested === "function"
@@ -2138,10 +2139,10 @@ function runExtractor(
           : { dispose: () => {} };
 
       proc.stdout.on("data", (d) => {
-        stdout += d.toString();
+        stdoutChunks.push(d);
       });
       proc.stderr.on("data", (d) => {
-        stderr += d.toString();
+        stderrChunks.push(d);
       });
 
       proc.on("error", (err) => {
@@ -2151,6 +2152,8 @@ function runExtractor(
 
       proc.on("close", (code) => {
         disposeCancel.dispose();
+        const stdout = Buffer.concat(stdoutChunks).toString("utf8");
+        const stderr = Buffer.concat(stderrChunks).toString("utf8");
         try {
           const parsed = JSON.parse(stdout);
           resolve(parsed);
@@ -7,7 +7,50 @@ import os
 import sys
 import traceback
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Set, Tuple
+from operator import attrgetter
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple, Union
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
+
+
+def _dump(obj: Any) -> bytes:
+    # orjson is optional: it is much faster on large call trees, stdlib json is the fallback.
+    # orjson emits raw UTF-8; the extension decodes stdout once after the process exits.
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # e.g. surrogate-escaped file names, which orjson rejects but json escapes
+            pass
+    return json.dumps(obj).encode("utf-8")
+
+
+def _write_payload(payload: Dict[str, Any]) -> None:
+    out = sys.stdout.buffer
+    out.write(_dump(payload))
+    out.write(b"\n")
+    out.flush()
+
+
+def _stream_payload(out_files: List[Dict[str, Any]], out_variables: List[Dict[str, Any]]) -> None:
+    """
+    Write the success payload, encoding and writing one file entry at a time so only
+    that entry's serialization is held in memory. Relies on _dump() not raising for
+    this plain-data payload, as a failure mid-stream would leave a partial document.
+    """
+    out = sys.stdout.buffer
+    out.write(b'{"version":1,"ok":true,"files":[')
+    for i, out_file in enumerate(out_files):
+        if i:
+            out.write(b",")
+        out.write(_dump(out_file))
+    out.write(b'],"variables":')
+    out.write(_dump(out_variables))
+    out.write(b"}\n")
+    out.flush()
 
 
 @dataclass(frozen=True)
@@ -17,6 +60,12 @@ class Location:
     character: int = 0
 
 
+def _location_dict(loc: Optional[Location]) -> Optional[Dict[str, Any]]:
+    if loc is None:
+        return None
+    return {"file": loc.file, "line": loc.line, "character": loc.character}
+
+
 def _location_from_source_mapping(obj: Any, workspace_root: str) -> Optional[Location]:
     try:
         src = getattr(obj, "source_mapping", None)
@@ -57,6 +106,20 @@ def _location_from_source_mapping(obj: Any, workspace_root: str) -> Optional[Loc
         return None
 
 
+_get_function_attrs = attrgetter("full_name", "name", "is_constructor")
+
+
+def _function_attrs(func: Any) -> Tuple[str, str, bool]:
+    """Return (full_name, name, is_constructor) in a single lookup."""
+    try:
+        full_name, name, is_constructor = _get_function_attrs(func)
+    except AttributeError:
+        full_name = getattr(func, "full_name", "")
+        name = getattr(func, "name", "")
+        is_constructor = getattr(func, "is_constructor", False)
+    return (full_name or "", name or "", bool(is_constructor))
+
+
 # Directories to exclude from entry point listing
 _EXCLUDED_DIRS = {"lib", "dependencies", "test", "tests", "script", "scripts", "node_modules", "mock", "mocks"}
 
@@ -339,13 +402,13 @@ def _serialize_call_tree(
     exclude_dependencies: bool,
     expand_dependencies: bool,
     depth: int = 0,
-    ancestors: Optional[Set[str]] = None,
+    ancestors: Union[Tuple[str, ...], FrozenSet[str]] = (),
 ) -> List[Dict[str, Any]]:
     if depth >= max_depth:
         return []
 
-    if ancestors is None:
-        ancestors = set()
+    # frozenset() returns a frozenset argument as-is, so recursive calls don't copy it again
+    ancestor_set: FrozenSet[str] = frozenset(ancestors)
 
     children: List[Dict[str, Any]] = []
 
@@ -363,7 +426,7 @@ def _serialize_call_tree(
         callsite_location = None
         if callsite_obj is not None:
             callsite_loc = _location_from_source_mapping(callsite_obj, workspace_root)
-            callsite_location = callsite_loc.__dict__ if callsite_loc else None
+            callsite_location = _location_dict(callsite_loc)
 
         canonical = getattr(target, "canonical_name", None)
         if isinstance(canonical, str) and canonical:
@@ -371,7 +434,7 @@ def _serialize_call_tree(
             label = _as_label_for_function(target)
             contract = _contract_name(target)
             location_obj = _location_from_source_mapping(target, workspace_root)
-            location = location_obj.__dict__ if location_obj else None
+            location = _location_dict(location_obj)
         else:
             # Solidity function / variable / unknown
             name = getattr(target, "name", None)
@@ -385,7 +448,7 @@ def _serialize_call_tree(
         if location is None and callsite_location is not None:
             location = callsite_location
 
-        cycle = node_id in ancestors
+        cycle = node_id in ancestor_set
         tooltip_parts = []
         tooltip_parts.append(canonical if isinstance(canonical, str) and canonical else label)
         tooltip = " • ".join([p for p in tooltip_parts if p])
@@ -406,8 +469,6 @@ def _serialize_call_tree(
             and canonical
             and (expand_dependencies or not (exclude_dependencies and _is_dependency(target)))
         ):
-            next_ancestors = set(ancestors)
-            next_ancestors.add(node_id)
             node["calls"] = _serialize_call_tree(
                 target,
                 workspace_root=workspace_root,
@@ -415,7 +476,7 @@ def _serialize_call_tree(
                 exclude_dependencies=exclude_dependencies,
                 expand_dependencies=expand_dependencies,
                 depth=depth + 1,
-                ancestors=next_ancestors,
+                ancestors=ancestor_set.union((node_id,)),
             )
 
         children.append(node)
@@ -582,7 +643,7 @@ def _extract_variables(
                         "flowId": f"{file_rel}::{ep_canonical}",
                         "label": ep_label,
                         "contract": ep_contract,
-                        "location": ep_loc.__dict__ if ep_loc else None,
+                        "location": _location_dict(ep_loc),
                     })
 
                 # Sort modifiers by label for consistent output
@@ -597,7 +658,7 @@ def _extract_variables(
                     "inheritedFrom": inherited_from,
                     "isConstant": bool(getattr(state_var, "is_constant", False)),
                     "isImmutable": bool(getattr(state_var, "is_immutable", False)),
-                    "location": var_loc.__dict__ if var_loc else None,
+                    "location": _location_dict(var_loc),
                     "modifiers": modifiers,
                 }
 
@@ -705,7 +766,7 @@ def main() -> int:
                 f"Details: {e}"
             ),
         }
-        print(json.dumps(payload))
+        _write_payload(payload)
         return 1
 
     try:
@@ -745,55 +806,55 @@ def main() -> int:
         #   - Dependency parent contracts (when exclude_dependencies=true, their functions are not listed directly)
         def get_inherited_functions(contract: Any) -> List[Tuple[Any, str]]:
             result: List[Tuple[Any, str]] = []
-            seen_funcs: Set[str] = set()  # Track by full_name to deduplicate
+            seen_funcs: Set[Tuple[str, str]] = set()  # (parent_name, full_name) for constructors, ("", full_name) otherwise
             inheritance = getattr(contract, "inheritance", []) or []
-            for parent in inheritance:
-                parent_name = getattr(parent, "name", "")
-                # Include inherited functions if parent is abstract or a dependency
-                is_abstract_parent = parent_name in abstract_contracts
-                is_dependency_parent = exclude_dependencies and _is_dependency(parent)
-                if not is_abstract_parent and not is_dependency_parent:
-                    continue
+            # Include inherited functions only if parent is abstract or a dependency
+            parents = [
+                (parent, parent_name)
+                for parent in inheritance
+                if (parent_name := getattr(parent, "name", "")) in abstract_contracts
+                or (exclude_dependencies and _is_dependency(parent))
+            ]
+            if not parents:
+                return result
+            # Signatures declared in the concrete contract itself, used to detect overrides
+            own_names: Set[str] = {
+                getattr(own_f, "full_name", "") or getattr(own_f, "name", "")
+                for own_f in getattr(contract, "functions_declared", []) or []
+            }
+            for parent, parent_name in parents:
                 for f in getattr(parent, "functions_declared", []) or []:
                     if not isinstance(f, FunctionContract):
                         continue
                     if not _is_state_changing_entrypoint(f):
                         continue
-                    f_name = getattr(f, "full_name", "") or getattr(f, "name", "")
-                    is_constructor = getattr(f, "is_constructor", False)
+                    full_name, name, is_constructor = _function_attrs(f)
+                    f_name = full_name or name
                     # Use contract-qualified name for dedup key to allow same-signature constructors from different parents
-                    dedup_key = f"{parent_name}.{f_name}" if is_constructor else f_name
+                    dedup_key = (parent_name, f_name) if is_constructor else ("", f_name)
                     # Skip if already seen (dedup across inheritance chain)
                     if dedup_key in seen_funcs:
                         continue
                     # Check if this function is overridden in the concrete contract (skip for constructors)
-                    is_overridden = False
-                    if not is_constructor:
-                        for own_f in getattr(contract, "functions_declared", []) or []:
-                            own_f_name = getattr(own_f, "full_name", "") or getattr(own_f, "name", "")
-                            if own_f_name == f_name:
-                                is_overridden = True
-                                break
+                    is_overridden = not is_constructor and f_name in own_names
                     if not is_overridden:
                         seen_funcs.add(dedup_key)
                         result.append((f, parent_name))
             return result
 
-        all_functions: List[Any] = []
-        for cu in getattr(sl, "compilation_units", []) or []:
-            all_functions.extend(getattr(cu, "functions", []) or [])
-
+        # Contract functions keyed by canonical name (first occurrence wins)
         by_canonical: Dict[str, Any] = {}
-        for f in all_functions:
-            canonical = getattr(f, "canonical_name", None)
-            if isinstance(canonical, str) and canonical and canonical not in by_canonical:
-                by_canonical[canonical] = f
+        for cu in getattr(sl, "compilation_units", []) or []:
+            for f in getattr(cu, "functions", []) or []:
+                if not isinstance(f, FunctionContract):
+                    continue
+                canonical = getattr(f, "canonical_name", None)
+                if isinstance(canonical, str) and canonical:
+                    by_canonical.setdefault(canonical, f)
 
         # Collect entrypoints, excluding those from abstract contracts
         entrypoints: List[Tuple[Any, Optional[str], Optional[Any]]] = []  # (func, origin_contract, concrete_contract)
         for f in by_canonical.values():
-            if not isinstance(f, FunctionContract):
-                continue
             if exclude_dependencies and _is_dependency(f):
                 continue
             if _is_state_changing_entrypoint(f):
@@ -809,23 +870,40 @@ def main() -> int:
             for func, origin_name in inherited:
                 entrypoints.append((func, origin_name, concrete))
 
-        files: Dict[str, List[Dict[str, Any]]] = {}
+        # Source-map lookups are repeated for every inherited function of a concrete contract;
+        # memoize by object identity (objects stay alive for the whole run).
+        loc_cache: Dict[int, Optional[Location]] = {}
+
+        def cached_location(obj: Any) -> Optional[Location]:
+            key = id(obj)
+            if key not in loc_cache:
+                loc_cache[key] = _location_from_source_mapping(obj, workspace_root)
+            return loc_cache[key]
+
+        # file -> [(sort_key, insertion_index, entrypoint)]
+        # Sort keys are (inherited, line, label): inherited=False (0) comes before inherited=True (1)
+        files: Dict[str, List[Tuple[Tuple[int, int, str], int, Dict[str, Any]]]] = {}
 
         for f, origin_contract, concrete_contract in entrypoints:
             # For inherited functions, use concrete contract's location
             if concrete_contract is not None:
-                concrete_loc = _location_from_source_mapping(concrete_contract, workspace_root)
+                concrete_loc = cached_location(concrete_contract)
                 if concrete_loc is None:
                     continue
                 file_rel = concrete_loc.file
                 contract = getattr(concrete_contract, "name", "") or ""
             else:
-                loc = _location_from_source_mapping(f, workspace_root)
+                loc = cached_location(f)
                 if loc is None:
                     continue
                 file_rel = loc.file
                 contract = _contract_name(f) or ""
 
+            # The same path/contract strings repeat across many entrypoints; share one copy
+            file_rel = sys.intern(file_rel)
+            contract = sys.intern(contract)
+            origin_contract = sys.intern(origin_contract) if origin_contract else None
+
             canonical = getattr(f, "canonical_name", "")
             base_label = _as_label_for_function(f)
 
@@ -843,7 +921,7 @@ def main() -> int:
             tooltip = f"{canonical} • {file_rel}" if canonical else f"{label} • {file_rel}"
 
             # Use function's actual location for jumping
-            func_loc = _location_from_source_mapping(f, workspace_root)
+            func_loc = cached_location(f)
 
             ep_obj: Dict[str, Any] = {
                 "flowId": flow_id,
@@ -852,7 +930,7 @@ def main() -> int:
                 "tooltip": tooltip,
                 "inherited": bool(origin_contract),
                 "inheritedFrom": inherited_from,
-                "location": func_loc.__dict__ if func_loc else {"file": file_rel, "line": 0, "character": 0},
+                "location": _location_dict(func_loc) or {"file": file_rel, "line": 0, "character": 0},
                 "calls": _serialize_call_tree(
                     f,
                     workspace_root=workspace_root,
@@ -860,34 +938,24 @@ def main() -> int:
                     exclude_dependencies=exclude_dependencies,
                     expand_dependencies=expand_dependencies,
                     depth=0,
-                    ancestors=set([canonical]) if canonical else set([base_label]),
+                    ancestors=(canonical,) if canonical else (base_label,),
                 ),
             }
 
-            files.setdefault(file_rel, []).append(ep_obj)
-
-        def _ep_key(e: Dict[str, Any]) -> Tuple[int, int, str]:
-            # Sort by: (inherited, line, label)
-            # inherited=False (0) comes before inherited=True (1)
-            inherited = 1 if e.get("inherited", False) else 0
-            try:
-                loc = e.get("location") or {}
-                line = int(loc.get("line", 10**9))
-            except Exception:
-                line = 10**9
-            return (inherited, line, str(e.get("label", "")))
+            ep_key = (1 if origin_contract else 0, func_loc.line if func_loc else 0, label)
+            file_eps = files.setdefault(file_rel, [])
+            file_eps.append((ep_key, len(file_eps), ep_obj))
 
         out_files = []
-        for file_path, eps in files.items():
-            eps.sort(key=_ep_key)
-            out_files.append({"path": file_path, "entrypoints": eps})
-        out_files.sort(key=lambda f: f.get("path", ""))
+        for file_path in sorted(files):
+            decorated = files[file_path]
+            decorated.sort()
+            out_files.append({"path": file_path, "entrypoints": [ep for _, _, ep in decorated]})
 
         # Extract state variables and their writing entry points
         out_variables = _extract_variables(sl, workspace_root, exclude_dependencies)
 
-        payload = {"version": 1, "ok": True, "files": out_files, "variables": out_variables}
-        print(json.dumps(payload))
+        _stream_payload(out_files, out_variables)
         return 0
 
     except Exception as e:
@@ -897,7 +965,7 @@ def main() -> int:
             "error": str(e),
             "traceback": traceback.format_exc(),
         }
-        print(json.dumps(payload))
+        _write_payload(payload)
         return 1
 
 